@@ -1,4 +1,5 @@
 import argparse
+import csv
 import logging
 import sys
 from importlib.metadata import version
@@ -119,6 +120,161 @@ def write_volume(
     )
 
 
+def thickness_maps(
+    surfaces: npt.NDArray[Any], axial_pixel_size: float
+) -> npt.NDArray[np.float32]:
+    """Compute layer thickness maps between adjacent segmentation surfaces.
+
+    Parameters
+    ----------
+    surfaces : npt.NDArray[Any]
+        A 3-dimensional array of surface depths in pixels, with surfaces along the first axis.
+    axial_pixel_size : float
+        The axial pixel size in mm.
+
+    Returns
+    -------
+    maps : npt.NDArray[np.float32]
+        A 3-dimensional array of layer thicknesses in µm, with layers along the first axis.
+        Negative values indicate crossed or out-of-order surfaces.
+
+    """
+    maps: npt.NDArray[np.float32] = (
+        (surfaces[1:] - surfaces[:-1]) * (axial_pixel_size * 1000)
+    ).astype(np.float32)
+    return maps
+
+
+def etdrs_sector_masks(
+    shape: tuple[int, int], pixel_size: float
+) -> dict[str, npt.NDArray[np.bool_]]:
+    """Build masks for the nine ETDRS grid sectors centred on the image.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        The image shape (rows, columns).
+    pixel_size : float
+        The lateral pixel size in mm.
+
+    Returns
+    -------
+    masks : dict[str, npt.NDArray[np.bool_]]
+        A dictionary of 2-dimensional boolean masks, keyed by sector name.
+
+    """
+    rows, columns = np.indices(shape)
+    dy = ((shape[0] - 1) / 2 - rows) * pixel_size
+    dx = (columns - (shape[1] - 1) / 2) * pixel_size
+    radius = np.hypot(dx, dy)
+    angle = np.degrees(np.arctan2(dy, dx)) % 360
+
+    quadrants = {
+        "superior": (angle >= 45) & (angle < 135),
+        "left": (angle >= 135) & (angle < 225),
+        "inferior": (angle >= 225) & (angle < 315),
+        "right": (angle >= 315) | (angle < 45),
+    }
+    rings = {
+        "inner": (radius >= 0.5) & (radius < 1.5),
+        "outer": (radius >= 1.5) & (radius < 3.0),
+    }
+
+    masks = {"central": radius < 0.5}
+    for ring_name, ring in rings.items():
+        for quadrant_name, quadrant in quadrants.items():
+            masks[f"{ring_name}_{quadrant_name}"] = ring & quadrant
+    return masks
+
+
+def sector_averages(
+    maps: npt.NDArray[Any], masks: dict[str, npt.NDArray[np.bool_]]
+) -> npt.NDArray[np.float64]:
+    """Compute the mean of each map within each sector.
+
+    Parameters
+    ----------
+    maps : npt.NDArray[Any]
+        A 3-dimensional array of maps, with maps along the first axis.
+    masks : dict[str, npt.NDArray[np.bool_]]
+        A dictionary of 2-dimensional boolean masks, keyed by sector name.
+
+    Returns
+    -------
+    averages : npt.NDArray[np.float64]
+        A 2-dimensional array of means, with one row per map and one column per sector.
+
+    """
+    weights = np.stack(list(masks.values())).astype(np.float64)
+    counts = weights.sum(axis=(1, 2))
+    sums = np.tensordot(maps, weights, axes=([1, 2], [1, 2]))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages: npt.NDArray[np.float64] = sums / counts
+    return averages
+
+
+def write_thickness_maps(
+    output_path: Path,
+    maps: npt.NDArray[np.float32],
+    layer_names: list[str],
+    pixel_size: float | None,
+) -> None:
+    """Write thickness maps to the output path as a multi-channel OME-TIFF file.
+
+    Parameters
+    ----------
+    output_path : Path
+        The specified output path.
+    maps : npt.NDArray[np.float32]
+        A 3-dimensional array of layer thicknesses in µm.
+    layer_names : list[str]
+        The channel name for each layer.
+    pixel_size : float | None
+        The lateral pixel size in mm.
+
+    """
+    metadata: dict[str, Any] = {"axes": "CYX", "Channel": {"Name": layer_names}}
+    if pixel_size is not None:
+        metadata["PhysicalSizeX"] = pixel_size
+        metadata["PhysicalSizeXUnit"] = "mm"
+        metadata["PhysicalSizeY"] = pixel_size
+        metadata["PhysicalSizeYUnit"] = "mm"
+    tifffile.imwrite(
+        output_path,
+        maps,
+        photometric="minisblack",
+        compression="zlib",
+        metadata=metadata,
+    )
+
+
+def write_thickness_csv(
+    output_path: Path,
+    averages: npt.NDArray[Any],
+    layer_names: list[str],
+    sector_names: list[str],
+) -> None:
+    """Write mean layer thicknesses to the output path as a CSV file.
+
+    Parameters
+    ----------
+    output_path : Path
+        The specified output path.
+    averages : npt.NDArray[Any]
+        A 2-dimensional array of means, with one row per layer and one column per sector.
+    layer_names : list[str]
+        The name of each layer.
+    sector_names : list[str]
+        The name of each sector.
+
+    """
+    with open(output_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["layer", *sector_names])
+        for layer_name, row in zip(layer_names, averages, strict=True):
+            writer.writerow([layer_name, *(f"{value:.3f}" for value in row)])
+
+
 def boundaries_to_arrays(input_path: Path) -> list[npt.NDArray[np.int_]]:
     """Extract segmentation lines.
 
@@ -173,11 +329,479 @@ def arrays_to_rois(arrays: list[npt.NDArray[np.int_]], output_path: Path) -> Non
     roiwrite(output_path, rois, mode="w")
 
 
+def read_volume(
+    input_path: Path,
+    size: float | None,
+    angio: bool,
+    en_face: bool,
+    seg_curve: bool,
+) -> tuple[npt.NDArray[Any], str, float | None, float | None, float | None]:
+    """Read an OCT file as a 3-dimensional array, with its scan pattern and voxel size.
+
+    The file is memory-mapped, so no data is read until the array is accessed.
+
+    Parameters
+    ----------
+    input_path : Path
+        The specified input path.
+    size : float | None
+        The scan size in mm.
+    angio : bool
+        Whether the file contains extracted OCTA data.
+    en_face : bool
+        Whether the file contains an extracted en face image.
+    seg_curve : bool
+        Whether the file contains extracted segmentation data.
+
+    Returns
+    -------
+    volume : npt.NDArray[Any]
+        A 3-dimensional array.
+    pattern : str
+        The name of the matched scan pattern.
+    pixel_size_x : float | None
+        The pixel (voxel) width in mm.
+    pixel_size_y : float | None
+        The pixel (voxel) height in mm.
+    pixel_size_z : float | None
+        The pixel (voxel) depth in mm.
+
+    Raises
+    ------
+    ValueError
+        If no supported scan pattern is found.
+
+    """
+    file_name = input_path.stem
+    volume: npt.NDArray[Any]
+    if angio:
+        pattern = "Angio"
+        volume = np.memmap(input_path, dtype=np.uint16, mode="r")
+        oct_window_height = 160
+        frames_per_data_group = int((len(volume) // oct_window_height) ** 0.5)
+        total_data_groups = 1
+        xy_scan_length = int((len(volume) // oct_window_height) ** 0.5)
+        pixel_size_x = size / xy_scan_length if size else None
+        pixel_size_y = 0.012283 if size else None
+        pixel_size_z = size / frames_per_data_group if size else None
+    elif en_face:
+        pattern = "En Face"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 1
+        total_data_groups = 1
+        oct_window_height = int(len(volume) ** 0.5)
+        xy_scan_length = int(len(volume) ** 0.5)
+        pixel_size_x = size / oct_window_height if size else None
+        pixel_size_y = size / xy_scan_length if size else None
+        pixel_size_z = None
+    elif seg_curve:
+        pattern = "Seg Curve"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        if len(volume) in (400 * 400 * 8, 400 * 400 * 7):
+            frames_per_data_group = 400
+            oct_window_height = 400
+        elif len(volume) in (304 * 304 * 8, 304 * 304 * 7):
+            frames_per_data_group = 304
+            oct_window_height = 304
+        else:
+            raise ValueError(
+                f"Could not find a supported scan pattern for volume length: {len(volume)}"
+            )
+        total_data_groups = 1
+        xy_scan_length = len(volume) // (frames_per_data_group * oct_window_height)
+        pixel_size_x = None
+        pixel_size_y = None
+        pixel_size_z = None
+    elif "3D Cornea" in file_name:
+        pattern = "3D Cornea"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 106
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 513
+        pixel_size_x = 0.007797
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.040000
+    elif "3D Disc" in file_name:
+        pattern = "3D Disc"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 106
+        total_data_groups = 1
+        oct_window_height = 768
+        xy_scan_length = 513
+        pixel_size_x = 0.011696
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.060000
+    elif "3D Retina" in file_name:
+        pattern = "3D Retina"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 144
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 385
+        pixel_size_x = 0.018182
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.050000
+    elif "3D Widefield MCT" in file_name:
+        pattern = "3D Widefield MCT"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 320
+        total_data_groups = 1
+        oct_window_height = 768
+        xy_scan_length = 320
+        pixel_size_x = 0.003075
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.028125
+    elif "3D Widefield" in file_name:
+        pattern = "3D Widefield"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 323
+        total_data_groups = 1
+        oct_window_height = 768
+        xy_scan_length = 320
+        pixel_size_x = 0.003075
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.028125
+    elif "Angle" in file_name:
+        pattern = "Angle"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 1
+        total_data_groups = 2
+        oct_window_height = 768
+        xy_scan_length = 1020
+        pixel_size_x = 0.002941
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Cornea Cross Line" in file_name:
+        pattern = "Cornea Cross Line"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 2
+        total_data_groups = 2
+        oct_window_height = 640
+        xy_scan_length = 941
+        pixel_size_x = 0.008502
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Cornea Line" in file_name:
+        pattern = "Cornea Line"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 1
+        total_data_groups = 2
+        oct_window_height = 640
+        xy_scan_length = 1020
+        pixel_size_x = 0.007843
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Cross Line" in file_name:
+        pattern = "Cross Line"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 2
+        total_data_groups = 2
+        oct_window_height = 768
+        xy_scan_length = 1020
+        pixel_size_x = 0.009804
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Enhanced HD Line" in file_name:
+        pattern = "Enhanced HD Line"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 1
+        total_data_groups = 2
+        oct_window_height = 960
+        xy_scan_length = 998
+        pixel_size_x = 0.012024
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "GCC" in file_name:
+        pattern = "GCC"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 16
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 933
+        pixel_size_x = 0.007503
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Grid" in file_name:
+        pattern = "Grid"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 10
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 1020
+        pixel_size_x = 0.005882
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "HD Angio Disc" in file_name:
+        pattern = "HD Angio Disc"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 400
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 400
+        pixel_size_x = 0.011250
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.011250
+        if size:
+            pixel_size_x = size / xy_scan_length
+            pixel_size_z = size / frames_per_data_group
+    elif "Angio Disc" in file_name:
+        pattern = "Angio Disc"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 304
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 304
+        pixel_size_x = 0.009868
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.009868
+        if size:
+            pixel_size_x = size / xy_scan_length
+            pixel_size_z = size / frames_per_data_group
+    elif "HD Angio Retina" in file_name:
+        pattern = "HD Angio Retina"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 400
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 400
+        pixel_size_x = 0.015000
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.015000
+    elif "Angio Retina" in file_name:
+        pattern = "Angio Retina"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 304
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 304
+        pixel_size_x = 0.019737
+        pixel_size_y = 0.003071
+        pixel_size_z = 0.019737
+        if size:
+            pixel_size_x = size / xy_scan_length
+            pixel_size_z = size / frames_per_data_group
+    elif "Radial Lines" in file_name:
+        pattern = "Radial Lines"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 18
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 1024
+        pixel_size_x = 0.009766
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Line" in file_name:
+        pattern = "Line"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 1
+        total_data_groups = 2
+        oct_window_height = 960
+        xy_scan_length = 1020
+        pixel_size_x = 0.008824
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "ONH" in file_name:
+        pattern = "ONH"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r", shape=(2223360,))
+        frames_per_data_group = 3
+        total_data_groups = 1
+        oct_window_height = 768
+        xy_scan_length = 965
+        pixel_size_x = 0.015952
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "PachymetryWide" in file_name:
+        pattern = "PachymetryWide"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 16
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 1536
+        pixel_size_x = 0.005859
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Raster" in file_name:
+        pattern = "Raster"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r")
+        frames_per_data_group = 21
+        total_data_groups = 1
+        oct_window_height = 768
+        xy_scan_length = 1020
+        pixel_size_x = 0.011765
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    elif "Retina Map" in file_name:
+        pattern = "Retina Map"
+        volume = np.memmap(input_path, dtype=np.float32, mode="r", shape=(6680960,))
+        frames_per_data_group = 13
+        total_data_groups = 1
+        oct_window_height = 640
+        xy_scan_length = 803
+        pixel_size_x = 0.007472
+        pixel_size_y = 0.003071
+        pixel_size_z = None
+    else:
+        raise ValueError(
+            f"Could not find a supported scan pattern in file name: {file_name}"
+        )
+
+    volume = reshape_volume(
+        volume,
+        frames_per_data_group,
+        total_data_groups,
+        oct_window_height,
+        xy_scan_length,
+    )
+
+    if not en_face and not seg_curve:
+        volume = np.rot90(volume, k=1, axes=(1, 2))
+
+    return volume, pattern, pixel_size_x, pixel_size_y, pixel_size_z
+
+
+def read_volumes(
+    input_path: Path,
+    size: float | None,
+    angio: bool,
+    en_face: bool,
+    seg_curve: bool,
+) -> list[tuple[npt.NDArray[Any], str, float | None, float | None, float | None]]:
+    """Read an OCT file as one or more 3-dimensional arrays.
+
+    3D Cornea scans are split into the main volume and the alignment volume,
+    which has a different voxel size.
+
+    Parameters
+    ----------
+    input_path : Path
+        The specified input path.
+    size : float | None
+        The scan size in mm.
+    angio : bool
+        Whether the file contains extracted OCTA data.
+    en_face : bool
+        Whether the file contains an extracted en face image.
+    seg_curve : bool
+        Whether the file contains extracted segmentation data.
+
+    Returns
+    -------
+    volumes : list[tuple[npt.NDArray[Any], str, float | None, float | None, float | None]]
+        A list of 3-dimensional arrays, each with its scan pattern and voxel size.
+
+    """
+    volume, pattern, pixel_size_x, pixel_size_y, pixel_size_z = read_volume(
+        input_path, size, angio, en_face, seg_curve
+    )
+    if pattern == "3D Cornea":
+        return [
+            (volume[:101], pattern, pixel_size_x, pixel_size_y, pixel_size_z),
+            (volume[101:], "3D Cornea Align", 0.003899, 0.003071, 0.040000),
+        ]
+    return [(volume, pattern, pixel_size_x, pixel_size_y, pixel_size_z)]
+
+
+def group_volumes(
+    input_paths: list[Path],
+    size: float | None,
+    angio: bool,
+    en_face: bool,
+    seg_curve: bool,
+) -> dict[tuple[Any, ...], list[tuple[Path, int]]]:
+    """Group the volumes in OCT files by scan pattern, shape and voxel size.
+
+    Parameters
+    ----------
+    input_paths : list[Path]
+        The specified input paths.
+    size : float | None
+        The scan size in mm.
+    angio : bool
+        Whether the files contain extracted OCTA data.
+    en_face : bool
+        Whether the files contain extracted en face images.
+    seg_curve : bool
+        Whether the files contain extracted segmentation data.
+
+    Returns
+    -------
+    groups : dict[tuple[Any, ...], list[tuple[Path, int]]]
+        A dictionary mapping (shape, dtype, pattern, pixel sizes) to the input
+        path and volume index of each member, in input order.
+
+    """
+    groups: dict[tuple[Any, ...], list[tuple[Path, int]]] = {}
+    for input_path in input_paths:
+        volumes = read_volumes(input_path, size, angio, en_face, seg_curve)
+        for index, (volume, *geometry) in enumerate(volumes):
+            key = (volume.shape, volume.dtype, *geometry)
+            groups.setdefault(key, []).append((input_path, index))
+    return groups
+
+
+def stack_volumes(
+    output_path: Path,
+    input_paths: list[Path],
+    size: float | None,
+    angio: bool,
+    en_face: bool,
+    seg_curve: bool,
+) -> None:
+    """Write OCT files to the output path as a single BigTIFF OME-TIFF file.
+
+    Volumes with the same scan pattern, shape and voxel size are written as
+    one time series (TZYX), in input order. Each distinct group is written as
+    a separate series named after its scan pattern, with the input path of
+    each timepoint in the metadata. The alignment frames of 3D Cornea scans
+    are written as their own series.
+
+    Parameters
+    ----------
+    output_path : Path
+        The specified output path.
+    input_paths : list[Path]
+        The specified input paths.
+    size : float | None
+        The scan size in mm.
+    angio : bool
+        Whether the files contain extracted OCTA data.
+    en_face : bool
+        Whether the files contain extracted en face images.
+    seg_curve : bool
+        Whether the files contain extracted segmentation data.
+
+    """
+    groups = group_volumes(input_paths, size, angio, en_face, seg_curve)
+
+    with tifffile.TiffWriter(output_path, bigtiff=True, ome=True) as tif:
+        for (shape, dtype, pattern, *pixel_sizes), members in groups.items():
+            logger.info(f"Stacking {len(members)} {pattern} volumes")
+            metadata = volume_metadata(*pixel_sizes)
+            metadata["axes"] = "TZYX"
+            metadata["Name"] = pattern
+            metadata["MapAnnotation"] = {
+                str(timepoint): str(path) for timepoint, (path, _) in enumerate(members)
+            }
+            timepoints = (
+                read_volumes(path, size, angio, en_face, seg_curve)[index][0]
+                for path, index in members
+            )
+            frames = (frame for volume in timepoints for frame in volume)
+            tif.write(
+                frames,
+                shape=(len(members), *shape),
+                dtype=dtype,
+                photometric="minisblack",
+                metadata=metadata,
+            )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Convert optical coherence tomography angiography (OCTA) data."
     )
-    parser.add_argument("input", type=Path, help="OCT file to convert")
+    parser.add_argument("input", type=Path, nargs="+", help="OCT file(s) to convert")
     parser.add_argument("--output", type=Path, help="specify a custom output directory")
     parser.add_argument(
         "--overwrite",
@@ -211,6 +835,24 @@ def main() -> None:
         action="store_true",
         help="convert segmentation lines to ImageJ ROIs",
     )
+    group.add_argument(
+        "--thickness",
+        default=False,
+        action="store_true",
+        help="compute layer thickness maps from extracted segmentation data",
+    )
+    parser.add_argument(
+        "--etdrs",
+        default=False,
+        action="store_true",
+        help="include ETDRS sector averages with --thickness (requires --size >= 6)",
+    )
+    parser.add_argument(
+        "--stack",
+        default=False,
+        action="store_true",
+        help="stack files with identical scan geometry into one BigTIFF file",
+    )
     parser.add_argument(
         "--log-level",
         default="WARNING",
@@ -234,7 +876,23 @@ def main() -> None:
         logger.error("--size cannot be greater than 12 mm")
         sys.exit(1)
 
-    input_path = args.input
+    if args.etdrs and not (args.thickness and args.size):
+        logger.error("--etdrs requires --thickness and --size")
+        sys.exit(1)
+
+    if args.etdrs and args.size < 6:
+        logger.error("--etdrs requires a --size of at least 6 mm")
+        sys.exit(1)
+
+    if len(args.input) > 1 and not args.stack:
+        logger.error("multiple input files require --stack")
+        sys.exit(1)
+
+    if args.stack and (args.boundaries or args.thickness):
+        logger.error("--stack cannot be used with --boundaries or --thickness")
+        sys.exit(1)
+
+    input_path = args.input[0]
     if args.output:
         dir_name = args.output
         dir_name.mkdir(parents=True, exist_ok=True)
@@ -243,308 +901,75 @@ def main() -> None:
     file_name = input_path.stem
     if args.boundaries:
         file_extension = "_rois.zip"
+    elif args.thickness:
+        file_extension = "_thickness.ome.tif"
+    elif args.stack:
+        file_extension = "_stack.ome.tif"
     else:
         file_extension = ".ome.tif"
     output_path = dir_name / (file_name + file_extension)
+    csv_path = dir_name / (file_name + "_thickness.csv")
 
-    if Path.is_file(output_path):
-        if args.overwrite:
-            logger.warning(f"Overwriting {output_path}")
-        else:
-            logger.error(f"{output_path} already exists.")
-            sys.exit(1)
+    for path in (output_path, csv_path) if args.thickness else (output_path,):
+        if Path.is_file(path):
+            if args.overwrite:
+                logger.warning(f"Overwriting {path}")
+            else:
+                logger.error(f"{path} already exists.")
+                sys.exit(1)
 
     if args.boundaries:
         arrays = boundaries_to_arrays(input_path)
         arrays_to_rois(arrays, output_path)
         return
 
-    with open(input_path, "rb") as f:
-        if args.angio:
-            volume = np.frombuffer(f.read(), dtype=np.uint16)
-            oct_window_height = 160
-            frames_per_data_group = int((len(volume) // oct_window_height) ** 0.5)
-            total_data_groups = 1
-            xy_scan_length = int((len(volume) // oct_window_height) ** 0.5)
-            pixel_size_x = args.size / xy_scan_length if args.size else None
-            pixel_size_y = 0.012283 if args.size else None
-            pixel_size_z = args.size / frames_per_data_group if args.size else None
-        elif args.en_face:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 1
-            total_data_groups = 1
-            oct_window_height = int(len(volume) ** 0.5)
-            xy_scan_length = int(len(volume) ** 0.5)
-            pixel_size_x = args.size / oct_window_height if args.size else None
-            pixel_size_y = args.size / xy_scan_length if args.size else None
-            pixel_size_z = None
-        elif args.seg_curve:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            if len(volume) in (400 * 400 * 8, 400 * 400 * 7):
-                frames_per_data_group = 400
-                oct_window_height = 400
-            elif len(volume) in (304 * 304 * 8, 304 * 304 * 7):
-                frames_per_data_group = 304
-                oct_window_height = 304
-            else:
-                raise ValueError(
-                    f"Could not find a supported scan pattern for volume length: {len(volume)}"
-                )
-            total_data_groups = 1
-            xy_scan_length = len(volume) // (frames_per_data_group * oct_window_height)
-            pixel_size_x = None
-            pixel_size_y = None
-            pixel_size_z = None
-        elif "3D Cornea" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 106
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 513
-            pixel_size_x = 0.007797
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.040000
-
-            volume = reshape_volume(
-                volume,
-                frames_per_data_group,
-                total_data_groups,
-                oct_window_height,
-                xy_scan_length,
-            )
-            volume = np.rot90(volume, k=1, axes=(1, 2))
-            volume_main = volume[:101]
-            volume_align = volume[101:frames_per_data_group]
-            align_path = dir_name / (file_name + "_Align.ome.tif")
-            pixel_size_x_align = 0.003899
-            pixel_size_y_align = 0.003071
-            pixel_size_z_align = 0.040000
-            write_volume(
-                output_path, volume_main, pixel_size_x, pixel_size_y, pixel_size_z
-            )
-            write_volume(
-                align_path,
-                volume_align,
-                pixel_size_x_align,
-                pixel_size_y_align,
-                pixel_size_z_align,
-            )
-            return
-        elif "3D Disc" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 106
-            total_data_groups = 1
-            oct_window_height = 768
-            xy_scan_length = 513
-            pixel_size_x = 0.011696
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.060000
-        elif "3D Retina" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 144
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 385
-            pixel_size_x = 0.018182
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.050000
-        elif "3D Widefield MCT" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 320
-            total_data_groups = 1
-            oct_window_height = 768
-            xy_scan_length = 320
-            pixel_size_x = 0.003075
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.028125
-        elif "3D Widefield" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 323
-            total_data_groups = 1
-            oct_window_height = 768
-            xy_scan_length = 320
-            pixel_size_x = 0.003075
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.028125
-        elif "Angle" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 1
-            total_data_groups = 2
-            oct_window_height = 768
-            xy_scan_length = 1020
-            pixel_size_x = 0.002941
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Cornea Cross Line" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 2
-            total_data_groups = 2
-            oct_window_height = 640
-            xy_scan_length = 941
-            pixel_size_x = 0.008502
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Cornea Line" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 1
-            total_data_groups = 2
-            oct_window_height = 640
-            xy_scan_length = 1020
-            pixel_size_x = 0.007843
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Cross Line" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 2
-            total_data_groups = 2
-            oct_window_height = 768
-            xy_scan_length = 1020
-            pixel_size_x = 0.009804
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Enhanced HD Line" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 1
-            total_data_groups = 2
-            oct_window_height = 960
-            xy_scan_length = 998
-            pixel_size_x = 0.012024
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "GCC" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 16
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 933
-            pixel_size_x = 0.007503
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Grid" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 10
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 1020
-            pixel_size_x = 0.005882
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "HD Angio Disc" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 400
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 400
-            pixel_size_x = 0.011250
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.011250
-            if args.size:
-                pixel_size_x = args.size / xy_scan_length
-                pixel_size_z = args.size / frames_per_data_group
-        elif "Angio Disc" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 304
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 304
-            pixel_size_x = 0.009868
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.009868
-            if args.size:
-                pixel_size_x = args.size / xy_scan_length
-                pixel_size_z = args.size / frames_per_data_group
-        elif "HD Angio Retina" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 400
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 400
-            pixel_size_x = 0.015000
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.015000
-        elif "Angio Retina" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 304
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 304
-            pixel_size_x = 0.019737
-            pixel_size_y = 0.003071
-            pixel_size_z = 0.019737
-            if args.size:
-                pixel_size_x = args.size / xy_scan_length
-                pixel_size_z = args.size / frames_per_data_group
-        elif "Radial Lines" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 18
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 1024
-            pixel_size_x = 0.009766
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Line" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 1
-            total_data_groups = 2
-            oct_window_height = 960
-            xy_scan_length = 1020
-            pixel_size_x = 0.008824
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "ONH" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32, count=2223360)
-            frames_per_data_group = 3
-            total_data_groups = 1
-            oct_window_height = 768
-            xy_scan_length = 965
-            pixel_size_x = 0.015952
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "PachymetryWide" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 16
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 1536
-            pixel_size_x = 0.005859
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Raster" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32)
-            frames_per_data_group = 21
-            total_data_groups = 1
-            oct_window_height = 768
-            xy_scan_length = 1020
-            pixel_size_x = 0.011765
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        elif "Retina Map" in file_name:
-            volume = np.frombuffer(f.read(), dtype=np.float32, count=6680960)
-            frames_per_data_group = 13
-            total_data_groups = 1
-            oct_window_height = 640
-            xy_scan_length = 803
-            pixel_size_x = 0.007472
-            pixel_size_y = 0.003071
-            pixel_size_z = None
-        else:
-            raise ValueError(
-                f"Could not find a supported scan pattern in file name: {file_name}"
-            )
-
-        volume = reshape_volume(
-            volume,
-            frames_per_data_group,
-            total_data_groups,
-            oct_window_height,
-            xy_scan_length,
+    if args.stack:
+        stack_volumes(
+            output_path,
+            args.input,
+            args.size,
+            args.angio,
+            args.en_face,
+            args.seg_curve,
         )
+        return
 
-        if not args.en_face and not args.seg_curve:
-            volume = np.rot90(volume, k=1, axes=(1, 2))
+    volumes = read_volumes(
+        input_path,
+        args.size,
+        args.angio,
+        args.en_face,
+        args.seg_curve or args.thickness,
+    )
+    volume, _, pixel_size_x, pixel_size_y, pixel_size_z = volumes[0]
+
+    if args.thickness:
+        surfaces = np.swapaxes(volume, 0, 1)
+        maps = thickness_maps(surfaces, axial_pixel_size=0.003071)
+        layer_names = [f"layer_{i + 1}" for i in range(len(maps))]
+        pixel_size = args.size / maps.shape[1] if args.size else None
+        masks = {"mean": np.ones(maps.shape[1:], dtype=bool)}
+        if args.etdrs and pixel_size is not None:
+            masks.update(etdrs_sector_masks(maps.shape[1:], pixel_size))
+        averages = sector_averages(maps, masks)
+        write_thickness_maps(output_path, maps, layer_names, pixel_size)
+        write_thickness_csv(csv_path, averages, layer_names, list(masks))
+        return
+
+    write_volume(output_path, volume, pixel_size_x, pixel_size_y, pixel_size_z)
 
-        write_volume(output_path, volume, pixel_size_x, pixel_size_y, pixel_size_z)
+    if len(volumes) > 1:
+        volume_align, _, pixel_size_x_align, pixel_size_y_align, pixel_size_z_align = (
+            volumes[1]
+        )
+        align_path = dir_name / (file_name + "_Align.ome.tif")
+        write_volume(
+            align_path,
+            volume_align,
+            pixel_size_x_align,
+            pixel_size_y_align,
+            pixel_size_z_align,
+        )
 
 
 if __name__ == "__main__":
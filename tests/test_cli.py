@@ -1,12 +1,23 @@
 from pathlib import Path
+from typing import Any
 
 import numpy as np
+import numpy.typing as npt
+import pytest
+import tifffile
 from roifile import ROI_TYPE, roiread
 
+from oct_to_tiff import cli
 from oct_to_tiff.cli import (
     arrays_to_rois,
     boundaries_to_arrays,
+    etdrs_sector_masks,
+    group_volumes,
+    read_volume,
     reshape_volume,
+    sector_averages,
+    stack_volumes,
+    thickness_maps,
     volume_metadata,
 )
 
@@ -66,6 +77,85 @@ def test_boundaries_to_arrays_returns_arrays_from_curve_xml(tmp_path: Path) -> N
     np.testing.assert_array_equal(result, expected)
 
 
+def test_etdrs_sector_masks_returns_nine_disjoint_sectors() -> None:
+    # Arrange
+    shape = (61, 61)
+    pixel_size = 0.1
+
+    # Act
+    result = etdrs_sector_masks(shape, pixel_size)
+
+    # Assert
+    assert len(result) == 9
+    assert result["central"][30, 30]
+    assert result["inner_superior"][20, 30]
+    assert result["outer_right"][30, 55]
+    coverage = np.sum(list(result.values()), axis=0)
+    assert coverage.max() == 1
+
+
+def test_group_volumes_separates_scan_patterns_with_the_same_shape(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    def fake_read_volume(
+        input_path: Path,
+        size: float | None,
+        angio: bool,
+        en_face: bool,
+        seg_curve: bool,
+    ) -> tuple[npt.NDArray[Any], str, float | None, float | None, float | None]:
+        pattern = input_path.stem.split(" ", 1)[1]
+        frames = 106 if pattern == "3D Cornea" else 3
+        volume = np.zeros((frames, 4, 2), dtype=np.float32)
+        return volume, pattern, 0.01, 0.003071, 0.01
+
+    monkeypatch.setattr(cli, "read_volume", fake_read_volume)
+    input_paths = [
+        Path("V1 Angio Retina.OCT"),
+        Path("V1 Angio Disc.OCT"),
+        Path("V2 Angio Retina.OCT"),
+        Path("V1 3D Cornea.OCT"),
+    ]
+
+    # Act
+    result = group_volumes(
+        input_paths, 6.0, angio=False, en_face=False, seg_curve=False
+    )
+
+    # Assert
+    patterns = {key[2]: members for key, members in result.items()}
+    assert list(patterns) == [
+        "Angio Retina",
+        "Angio Disc",
+        "3D Cornea",
+        "3D Cornea Align",
+    ]
+    assert patterns["Angio Retina"] == [(input_paths[0], 0), (input_paths[2], 0)]
+    assert patterns["Angio Disc"] == [(input_paths[1], 0)]
+    assert patterns["3D Cornea"] == [(input_paths[3], 0)]
+    assert patterns["3D Cornea Align"] == [(input_paths[3], 1)]
+    shapes = {key[2]: key[0] for key in result}
+    assert shapes["3D Cornea"] == (101, 4, 2)
+    assert shapes["3D Cornea Align"] == (5, 4, 2)
+
+
+def test_read_volume_returns_en_face_image_and_pixel_sizes(tmp_path: Path) -> None:
+    # Arrange
+    input_path = tmp_path / "en_face.bin"
+    np.arange(16, dtype=np.float32).tofile(input_path)
+
+    # Act
+    result = read_volume(input_path, 2.0, angio=False, en_face=True, seg_curve=False)
+
+    # Assert
+    volume, pattern, pixel_size_x, pixel_size_y, pixel_size_z = result
+    expected = np.arange(16, dtype=np.float32).reshape(1, 4, 4)
+    np.testing.assert_array_equal(volume, expected)
+    assert pattern == "En Face"
+    assert (pixel_size_x, pixel_size_y, pixel_size_z) == (0.5, 0.5, None)
+
+
 def test_reshape_volume_returns_3d_array_from_1d_array() -> None:
     # Arrange
     volume = np.arange(8, dtype=np.float32)
@@ -124,3 +214,78 @@ def test_volume_metadata_returns_physical_sizes_and_units() -> None:
         "PhysicalSizeZUnit": "mm",
     }
     assert result == expected
+
+
+def test_sector_averages_returns_mean_per_map_and_sector() -> None:
+    # Arrange
+    maps = np.array(
+        [
+            [[1, 2], [3, 4]],
+            [[10, 20], [30, 40]],
+        ],
+        dtype=np.float32,
+    )
+    masks = {
+        "top": np.array([[True, True], [False, False]]),
+        "all": np.ones((2, 2), dtype=bool),
+    }
+
+    # Act
+    result = sector_averages(maps, masks)
+
+    # Assert
+    expected = np.array([[1.5, 2.5], [15.0, 25.0]])
+    np.testing.assert_allclose(result, expected)
+
+
+def test_stack_volumes_writes_one_series_per_scan_geometry(tmp_path: Path) -> None:
+    # Arrange
+    input_paths: list[Path] = []
+    for name, length in (("a.bin", 16), ("b.bin", 9), ("c.bin", 16)):
+        input_path = tmp_path / name
+        np.full(length, len(input_paths), dtype=np.float32).tofile(input_path)
+        input_paths.append(input_path)
+    output_path = tmp_path / "stack.ome.tif"
+
+    # Act
+    stack_volumes(
+        output_path, input_paths, None, angio=False, en_face=True, seg_curve=False
+    )
+
+    # Assert
+    with tifffile.TiffFile(output_path) as tif:
+        assert tif.is_bigtiff
+        assert len(tif.series) == 2
+        assert tif.series[0].get_axes(squeeze=False) == "TZCYXS"
+        assert tif.series[0].get_shape(squeeze=False) == (2, 1, 1, 4, 4, 1)
+        assert tif.series[1].get_shape(squeeze=False) == (1, 1, 1, 3, 3, 1)
+        np.testing.assert_array_equal(tif.series[0].asarray()[:, 0, 0], [0, 2])
+        assert tif.series[0].name == "En Face"
+        ome_metadata = tif.ome_metadata
+        assert ome_metadata is not None
+        assert str(input_paths[2]) in ome_metadata
+
+
+def test_thickness_maps_returns_signed_adjacent_surface_differences_in_um() -> None:
+    # Arrange
+    surfaces = np.array(
+        [
+            [[10, 10], [10, 10]],
+            [[20, 30], [40, 50]],
+            [[25, 35], [45, 45]],
+        ],
+        dtype=np.float32,
+    )
+
+    # Act
+    result = thickness_maps(surfaces, axial_pixel_size=0.002)
+
+    # Assert
+    expected = np.array(
+        [
+            [[20, 40], [60, 80]],
+            [[10, 10], [10, -10]],
+        ],
+        dtype=np.float32,
+    )
+    np.testing.assert_allclose(result, expected)